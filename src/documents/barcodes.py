@@ -2,6 +2,7 @@ import logging
 import os
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import List  # for type hinting. Can be removed, if only Python >3.8 is used
 
@@ -105,13 +106,22 @@ def scan_file_for_separating_barcodes(filepath: str) -> List[int]:
     """
     separator_page_numbers = []
     separator_barcode = str(settings.CONSUMER_BARCODE_STRING)
+    threads = max(int(settings.THREADS_PER_WORKER), 1)
     # use a temporary directory in case the file os too big to handle in memory
     with tempfile.TemporaryDirectory() as path:
-        pages_from_path = convert_from_path(filepath, output_folder=path)
-        for current_page_number, page in enumerate(pages_from_path):
-            current_barcodes = barcode_reader(page)
-            if separator_barcode in current_barcodes:
-                separator_page_numbers.append(current_page_number)
+        pages_from_path = convert_from_path(
+            filepath,
+            output_folder=path,
+            thread_count=threads,
+        )
+        # zbar releases the GIL while decoding, so the pages can be scanned in
+        # threads. Task workers are daemonic and can't use a process pool.
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for current_page_number, current_barcodes in enumerate(
+                executor.map(barcode_reader, pages_from_path),
+            ):
+                if separator_barcode in current_barcodes:
+                    separator_page_numbers.append(current_page_number)
     return separator_page_numbers
 
 
@@ -66,3 +66,16 @@ def parser_check(app_configs, **kwargs):
         ]
     else:
         return []
+
+
+@register()
+def archive_checksum_algorithm_check(app_configs, **kwargs):
+    if settings.ARCHIVE_CHECKSUM_ALGORITHM not in ["md5", "sha256"]:
+        return [
+            Error(
+                "PAPERLESS_ARCHIVE_CHECKSUM_ALGORITHM must be either md5 or "
+                f"sha256, not {settings.ARCHIVE_CHECKSUM_ALGORITHM}.",
+            ),
+        ]
+    else:
+        return []
@@ -8,8 +8,12 @@ import warnings
 from typing import Optional
 
 from django.conf import settings
+from documents.models import Correspondent
 from documents.models import Document
+from documents.models import DocumentType
 from documents.models import MatchingModel
+from documents.models import StoragePath
+from documents.models import Tag
 
 
 class IncompatibleClassifierVersionError(Exception):
@@ -63,6 +67,63 @@ def load_classifier() -> Optional["DocumentClassifier"]:
     return classifier
 
 
+def get_training_data_fingerprint() -> str:
+    """
+    Cheap fingerprint of everything the training data is derived from. Unlike
+    the data hash of the classifier, this does not read the content of all
+    documents. Content changes are picked up via the modification date and
+    the archive checksum.
+
+    The version of scikit-learn is part of the fingerprint, so that a model
+    pickled by another version is retrained.
+    """
+    import sklearn
+
+    querysets = [
+        Document.objects.values_list(
+            "pk",
+            "modified",
+            "archive_checksum",
+            "correspondent_id",
+            "document_type_id",
+            "storage_path_id",
+        ),
+        Document.tags.through.objects.values_list("document_id", "tag_id"),
+        Tag.objects.values_list("pk", "matching_algorithm", "is_inbox_tag"),
+        Correspondent.objects.values_list("pk", "matching_algorithm"),
+        DocumentType.objects.values_list("pk", "matching_algorithm"),
+        StoragePath.objects.values_list("pk", "matching_algorithm"),
+    ]
+
+    m = hashlib.sha1()
+    m.update(str(DocumentClassifier.FORMAT_VERSION).encode("utf-8"))
+    m.update(sklearn.__version__.encode("utf-8"))
+    for queryset in querysets:
+        m.update(b"\0")
+        for row in queryset.order_by("pk").iterator():
+            m.update(repr(row).encode("utf-8"))
+
+    return m.hexdigest()
+
+
+def load_training_data_fingerprint() -> Optional[str]:
+    try:
+        with open(settings.MODEL_FILE + ".fingerprint") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def save_training_data_fingerprint(fingerprint: str):
+    target_file = settings.MODEL_FILE + ".fingerprint"
+    target_file_temp = target_file + ".part"
+
+    with open(target_file_temp, "w") as f:
+        f.write(fingerprint)
+
+    os.replace(target_file_temp, target_file)
+
+
 class DocumentClassifier:
 
     # v7 - Updated scikit-learn package version
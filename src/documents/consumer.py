@@ -17,6 +17,7 @@ from filelock import FileLock
 from rest_framework.reverse import reverse
 
 from .classifier import load_classifier
+from .file_handling import calculate_archive_checksum
 from .file_handling import create_source_path_directory
 from .file_handling import generate_unique_filename
 from .loggers import LoggingMixin
@@ -105,8 +106,12 @@ class Consumer(LoggingMixin):
     def pre_check_duplicate(self):
         with open(self.path, "rb") as f:
             checksum = hashlib.md5(f.read()).hexdigest()
+        if settings.ARCHIVE_CHECKSUM_ALGORITHM == "md5":
+            archive_checksum = checksum
+        else:
+            archive_checksum = calculate_archive_checksum(self.path)
         if Document.objects.filter(
-            Q(checksum=checksum) | Q(archive_checksum=checksum),
+            Q(checksum=checksum) | Q(archive_checksum=archive_checksum),
         ).exists():
             if settings.CONSUMER_DELETE_DUPLICATES:
                 os.unlink(self.path)
@@ -386,10 +391,9 @@ class Consumer(LoggingMixin):
                             document.archive_path,
                         )
 
-                        with open(archive_path, "rb") as f:
-                            document.archive_checksum = hashlib.md5(
-                                f.read(),
-                            ).hexdigest()
+                        document.archive_checksum = calculate_archive_checksum(
+                            archive_path,
+                        )
 
                 # Don't save with the lock active. Saving will cause the file
                 # renaming logic to acquire the lock as well.
@@ -1,5 +1,7 @@
 import datetime
+import hashlib
 import logging
+import mmap
 import os
 from collections import defaultdict
 
@@ -17,6 +19,29 @@ class defaultdictNoStr(defaultdict):
         raise ValueError("Don't use {tags} directly.")
 
 
+def calculate_archive_checksum(path):
+    """
+    Calculates the checksum of an archive file with the configured
+    PAPERLESS_ARCHIVE_CHECKSUM_ALGORITHM.
+    """
+    with open(path, "rb") as f:
+        # Empty files cannot be mapped.
+        if os.fstat(f.fileno()).st_size > 0:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h = hashlib.new(settings.ARCHIVE_CHECKSUM_ALGORITHM)
+                    h.update(mm)
+                    return h.hexdigest()
+            except (OSError, OverflowError, ValueError):
+                # Large files cannot be mapped on 32 bit systems.
+                f.seek(0)
+
+        h = hashlib.new(settings.ARCHIVE_CHECKSUM_ALGORITHM)
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 def create_source_path_directory(source_path):
     os.makedirs(os.path.dirname(source_path), exist_ok=True)
 
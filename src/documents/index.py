@@ -27,6 +27,10 @@ from whoosh.writing import AsyncWriter
 
 logger = logging.getLogger("paperless.index")
 
+# Opened indexes by index directory, reused within this process. Writers are
+# still created for each use, since a writer holds the lock of the index.
+_open_indexes = {}
+
 
 def get_schema():
     return Schema(
@@ -55,13 +59,19 @@ def get_schema():
 def open_index(recreate=False):
     try:
         if exists_in(settings.INDEX_DIR) and not recreate:
-            return open_dir(settings.INDEX_DIR, schema=get_schema())
+            if settings.INDEX_DIR not in _open_indexes:
+                _open_indexes[settings.INDEX_DIR] = open_dir(
+                    settings.INDEX_DIR,
+                    schema=get_schema(),
+                )
+            return _open_indexes[settings.INDEX_DIR]
     except Exception:
         logger.exception("Error while opening the index, recreating.")
 
     if not os.path.isdir(settings.INDEX_DIR):
         os.makedirs(settings.INDEX_DIR, exist_ok=True)
-    return create_in(settings.INDEX_DIR, get_schema())
+    _open_indexes[settings.INDEX_DIR] = create_in(settings.INDEX_DIR, get_schema())
+    return _open_indexes[settings.INDEX_DIR]
 
 
 @contextmanager
@@ -1,4 +1,3 @@
-import hashlib
 import logging
 import multiprocessing
 import os
@@ -14,6 +13,7 @@ from documents.models import Document
 from filelock import FileLock
 
 from ... import index
+from ...file_handling import calculate_archive_checksum
 from ...file_handling import create_source_path_directory
 from ...file_handling import generate_unique_filename
 from ...parsers import get_parser_class_for_mime_type
@@ -22,8 +22,31 @@ from ...parsers import get_parser_class_for_mime_type
 logger = logging.getLogger("paperless.management.archiver")
 
 
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _move(source, target):
+    # Move next to the target first and make sure the data is on disk before
+    # replacing the target, so that target is never left half written.
+    temp_target = target + ".tmp"
+    try:
+        # single rename, if both are on the same file system.
+        os.replace(source, temp_target)
+    except OSError:
+        shutil.move(source, temp_target)
+    _fsync(temp_target)
+    os.replace(temp_target, target)
+    _fsync(os.path.dirname(target))
+
+
 def handle_document(document_id):
-    document = Document.objects.get(id=document_id)
+    # The content is replaced by the text of the parser, don't load it.
+    document = Document.objects.defer("content").get(id=document_id)
 
     mime_type = document.mime_type
 
@@ -47,10 +70,11 @@ def handle_document(document_id):
             document.get_public_filename(),
         )
 
-        if parser.get_archive_path():
+        archive_path = parser.get_archive_path()
+
+        if archive_path:
             with transaction.atomic():
-                with open(parser.get_archive_path(), "rb") as f:
-                    checksum = hashlib.md5(f.read()).hexdigest()
+                checksum = calculate_archive_checksum(archive_path)
                 # I'm going to save first so that in case the file move
                 # fails, the database is rolled back.
                 # We also don't use save() since that triggers the filehandling
@@ -59,15 +83,16 @@ def handle_document(document_id):
                     document,
                     archive_filename=True,
                 )
+                document.content = parser.get_text()
                 Document.objects.filter(pk=document.pk).update(
                     archive_checksum=checksum,
-                    content=parser.get_text(),
+                    content=document.content,
                     archive_filename=document.archive_filename,
                 )
                 with FileLock(settings.MEDIA_LOCK):
                     create_source_path_directory(document.archive_path)
-                    shutil.move(parser.get_archive_path(), document.archive_path)
-                    shutil.move(thumbnail, document.thumbnail_path)
+                    _move(archive_path, document.archive_path)
+                    _move(thumbnail, document.thumbnail_path)
 
             with index.open_index_writer() as writer:
                 index.update_document(writer, document)
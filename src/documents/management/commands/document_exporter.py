@@ -28,6 +28,7 @@ from paperless.db import GnuPG
 from paperless_mail.models import MailAccount
 from paperless_mail.models import MailRule
 
+from ...file_handling import calculate_archive_checksum
 from ...file_handling import delete_empty_directories
 from ...file_handling import generate_filename
 
@@ -236,6 +237,7 @@ class Command(BaseCommand):
                         document.archive_path,
                         document.archive_checksum,
                         archive_target,
+                        archive=True,
                     )
 
         # 4.1 write manifest to target folder
@@ -264,7 +266,7 @@ class Command(BaseCommand):
                     os.path.abspath(self.target),
                 )
 
-    def check_and_copy(self, source, source_checksum, target):
+    def check_and_copy(self, source, source_checksum, target, archive=False):
         if os.path.abspath(target) in self.files_in_export_dir:
             self.files_in_export_dir.remove(os.path.abspath(target))
 
@@ -274,8 +276,11 @@ class Command(BaseCommand):
             source_stat = os.stat(source)
             target_stat = os.stat(target)
             if self.compare_checksums and source_checksum:
-                with open(target, "rb") as f:
-                    target_checksum = hashlib.md5(f.read()).hexdigest()
+                if archive:
+                    target_checksum = calculate_archive_checksum(target)
+                else:
+                    with open(target, "rb") as f:
+                        target_checksum = hashlib.md5(f.read()).hexdigest()
                 perform_copy = target_checksum != source_checksum
             elif source_stat.st_mtime != target_stat.st_mtime:
                 perform_copy = True
@@ -0,0 +1,53 @@
+import tqdm
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from documents.file_handling import calculate_archive_checksum
+from documents.models import Document
+
+
+class Command(BaseCommand):
+
+    help = """
+        Recalculates the checksums of all archived documents. This is
+        required after changing PAPERLESS_ARCHIVE_CHECKSUM_ALGORITHM.
+    """.replace(
+        "    ",
+        "",
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-progress-bar",
+            default=False,
+            action="store_true",
+            help="If set, the progress bar will not be shown",
+        )
+
+    def handle(self, *args, **options):
+        documents = Document.objects.filter(
+            archive_filename__isnull=False,
+            storage_type=Document.STORAGE_TYPE_UNENCRYPTED,
+        ).only("pk", "archive_filename", "archive_checksum")
+
+        updated = 0
+
+        for document in tqdm.tqdm(documents, disable=options["no_progress_bar"]):
+            try:
+                checksum = calculate_archive_checksum(document.archive_path)
+            except OSError as e:
+                self.stderr.write(
+                    f"Cannot read archive file of document {document.pk}: {e}",
+                )
+                continue
+
+            if checksum != document.archive_checksum:
+                # Don't use save(), this would trigger the file handling.
+                Document.objects.filter(pk=document.pk).update(
+                    archive_checksum=checksum,
+                )
+                updated += 1
+
+        self.stdout.write(
+            f"Updated {updated} archive checksums to "
+            f"{settings.ARCHIVE_CHECKSUM_ALGORITHM}.",
+        )
@@ -6,6 +6,7 @@ import re
 import shutil
 import subprocess
 import tempfile
+from functools import lru_cache
 from typing import Optional
 from typing import Set
 
@@ -81,7 +82,14 @@ def get_supported_file_extensions() -> Set[str]:
     return extensions
 
 
+@lru_cache(maxsize=64)
 def get_parser_class_for_mime_type(mime_type):
+    """
+    Returns the parser class with the highest weight for the mime type.
+    The result is cached, since parsers are only declared at startup. Call
+    get_parser_class_for_mime_type.cache_clear() after changing the
+    declared parsers.
+    """
 
     options = []
 
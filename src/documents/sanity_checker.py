@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Final
 
 from django.conf import settings
+from documents.file_handling import calculate_archive_checksum
 from documents.models import Document
 from tqdm import tqdm
 
@@ -120,7 +121,7 @@ def check_sanity(progress=False) -> SanityCheckMessages:
                 if archive_path in present_files:
                     present_files.remove(archive_path)
                 try:
-                    checksum = hashlib.md5(archive_path.read_bytes()).hexdigest()
+                    checksum = calculate_archive_checksum(archive_path)
                 except OSError as e:
                     messages.error(
                         doc.pk,
@@ -515,7 +515,7 @@ class PostDocumentSerializer(serializers.Serializer):
                 _("File type %(type)s not supported") % {"type": mime_type},
             )
 
-        return document.name, document_data
+        return document.name, document_data, mime_type
 
     def validate_correspondent(self, correspondent):
         if correspondent:
@@ -1,20 +1,30 @@
+import asyncio
 import logging
+import mimetypes
+import multiprocessing
 import os
 import shutil
+import tempfile
+import threading
+from itertools import islice
 from pathlib import Path
 from typing import Type
 
 import tqdm
-from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django import db
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.functions import Mod
 from django.db.models.signals import post_save
-from documents import barcodes
+from django_q.tasks import async_task
 from documents import index
 from documents import sanity_checker
 from documents.classifier import DocumentClassifier
+from documents.classifier import get_training_data_fingerprint
 from documents.classifier import load_classifier
+from documents.classifier import load_training_data_fingerprint
+from documents.classifier import save_training_data_fingerprint
 from documents.consumer import Consumer
 from documents.consumer import ConsumerError
 from documents.models import Correspondent
@@ -26,11 +36,61 @@ from documents.parsers import DocumentParser
 from documents.parsers import get_parser_class_for_mime_type
 from documents.parsers import ParseError
 from documents.sanity_checker import SanityCheckFailedException
+from whoosh.index import create_in
+from whoosh.index import open_dir
 from whoosh.writing import AsyncWriter
 
 
 logger = logging.getLogger("paperless.tasks")
 
+BULK_UPDATE_CHUNK_SIZE = 100
+
+# Seconds to wait for the lock of the index before building the reindex shards.
+REINDEX_LOCK_TIMEOUT = 600
+
+# Number of indexed documents, shared by the reindex shard processes.
+_reindex_progress = None
+
+_status_update_loop = None
+_status_update_loop_lock = threading.Lock()
+
+
+def _get_status_update_loop():
+    global _status_update_loop
+    with _status_update_loop_lock:
+        if _status_update_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+            _status_update_loop = loop
+    return _status_update_loop
+
+
+async def _group_send_status_update(payload):
+    try:
+        await get_channel_layer().group_send(
+            "status_updates",
+            {"type": "status_update", "data": payload},
+        )
+    except OSError as e:
+        logger.warning(
+            "OSError. It could be, the broker cannot be reached.",
+        )
+        logger.warning(str(e))
+    except Exception as e:
+        # Nobody waits for the result, so this would go unnoticed otherwise.
+        logger.exception(f"Error while sending a status update: {e}")
+
+
+def send_status_update(payload):
+    """
+    Sends a status update to the UI in the background, without waiting for
+    the channel layer.
+    """
+    return asyncio.run_coroutine_threadsafe(
+        _group_send_status_update(payload),
+        _get_status_update_loop(),
+    )
+
 
 def index_optimize():
     ix = index.open_index()
@@ -38,24 +98,128 @@ def index_optimize():
     writer.commit(optimize=True)
 
 
+def _init_reindex_shard(progress):
+    global _reindex_progress
+    _reindex_progress = progress
+
+
+def _reindex_shard(shard):
+    """
+    Indexes every document whose id modulo num_shards equals shard_number into
+    a separate index located in shard_dir, which is later merged into the main
+    index by index_reindex.
+    """
+    shard_dir, shard_number, num_shards = shard
+
+    documents = Document.objects.annotate(shard=Mod("id", num_shards)).filter(
+        shard=shard_number,
+    )
+
+    writer = create_in(shard_dir, index.get_schema()).writer()
+
+    try:
+        for document in documents:
+            index.update_document(writer, document)
+            with _reindex_progress.get_lock():
+                _reindex_progress.value += 1
+    except Exception:
+        writer.cancel()
+        raise
+
+    # The shard is merged into the main index anyway, no need to merge
+    # its segments.
+    writer.commit(merge=False)
+
+    return shard_dir
+
+
 def index_reindex(progress_bar_disable=False):
     documents = Document.objects.all()
+    total = documents.count()
 
     ix = index.open_index(recreate=True)
 
-    with AsyncWriter(ix) as writer:
-        for document in tqdm.tqdm(documents, disable=progress_bar_disable):
-            index.update_document(writer, document)
+    num_shards = min(settings.TASK_WORKERS, total)
+
+    if num_shards <= 1:
+        writer = AsyncWriter(ix)
+        try:
+            for document in tqdm.tqdm(
+                documents,
+                total=total,
+                disable=progress_bar_disable,
+            ):
+                index.update_document(writer, document)
+        except Exception:
+            writer.cancel()
+            raise
+        # Commit all documents at once and optimize a single time.
+        writer.commit(optimize=True)
+        return
+
+    os.makedirs(settings.SCRATCH_DIR, exist_ok=True)
+
+    # Hold the lock of the index until the shards are merged, like the serial
+    # path does. Writes of other processes are buffered by their AsyncWriter
+    # and applied afterwards, instead of being duplicated by the merge.
+    writer = ix.writer(timeout=REINDEX_LOCK_TIMEOUT)
+
+    try:
+        with tempfile.TemporaryDirectory(dir=settings.SCRATCH_DIR) as tempdir:
+            shards = []
+            for n in range(num_shards):
+                shard_dir = os.path.join(tempdir, f"shard_{n}")
+                os.makedirs(shard_dir)
+                shards.append((shard_dir, n, num_shards))
+
+            # Same as in the document archiver: prevent django from reusing
+            # database connections between processes.
+            db.connections.close_all()
+
+            progress = multiprocessing.Value("i", 0)
+
+            with multiprocessing.Pool(
+                processes=num_shards,
+                initializer=_init_reindex_shard,
+                initargs=(progress,),
+            ) as pool:
+                result = pool.map_async(_reindex_shard, shards)
+                with tqdm.tqdm(
+                    total=total,
+                    disable=progress_bar_disable,
+                ) as progress_bar:
+                    while not result.ready():
+                        result.wait(timeout=1)
+                        progress_bar.update(progress.value - progress_bar.n)
+                shard_dirs = result.get()
+
+            for shard_dir in shard_dirs:
+                shard_ix = open_dir(shard_dir, schema=index.get_schema())
+                with shard_ix.reader() as reader:
+                    writer.add_reader(reader)
+            writer.commit(optimize=True)
+    except Exception:
+        writer.cancel()
+        raise
 
 
 def train_classifier():
+    # Check all matching models with a single query.
+    auto_matching = [
+        model.objects.filter(matching_algorithm=Tag.MATCH_AUTO).values("pk")
+        for model in [Tag, DocumentType, Correspondent, StoragePath]
+    ]
+
+    if not auto_matching[0].union(*auto_matching[1:], all=True).exists():
+        return
+
+    fingerprint = get_training_data_fingerprint()
+
     if (
-        not Tag.objects.filter(matching_algorithm=Tag.MATCH_AUTO).exists()
-        and not DocumentType.objects.filter(matching_algorithm=Tag.MATCH_AUTO).exists()
-        and not Correspondent.objects.filter(matching_algorithm=Tag.MATCH_AUTO).exists()
-        and not StoragePath.objects.filter(matching_algorithm=Tag.MATCH_AUTO).exists()
+        os.path.isfile(settings.MODEL_FILE)
+        and load_training_data_fingerprint() == fingerprint
     ):
-
+        logger.debug("Training data unchanged.")
         return
 
     classifier = load_classifier()
@@ -71,6 +235,7 @@ def train_classifier():
             classifier.save()
         else:
             logger.debug("Training data unchanged.")
+        save_training_data_fingerprint(fingerprint)
 
     except Exception as e:
         logger.warning("Classifier error: " + str(e))
@@ -85,12 +250,25 @@ def consume_file(
     override_tag_ids=None,
     task_id=None,
     override_created=None,
+    mime_type=None,
 ):
 
     # check for separators in current document
     if settings.CONSUMER_ENABLE_BARCODES:
-
-        mime_type = barcodes.get_file_mime_type(path)
+        from documents import barcodes
+
+        # Callers which already detected the mime type may pass it along.
+        if mime_type is None:
+            # Don't inspect files if their extension already tells that the
+            # barcode reader can't handle them. Uploaded files and mail
+            # attachments have no extension and are always inspected.
+            guessed_mime_type, _ = mimetypes.guess_type(path)
+            if guessed_mime_type and not barcodes.supported_file_type(
+                guessed_mime_type,
+            ):
+                mime_type = guessed_mime_type
+            else:
+                mime_type = barcodes.get_file_mime_type(path)
 
         if not barcodes.supported_file_type(mime_type):
             # if not supported, skip this routine
@@ -144,16 +322,7 @@ def consume_file(
                     "status": "SUCCESS",
                     "message": "finished",
                 }
-                try:
-                    async_to_sync(get_channel_layer().group_send)(
-                        "status_updates",
-                        {"type": "status_update", "data": payload},
-                    )
-                except OSError as e:
-                    logger.warning(
-                        "OSError. It could be, the broker cannot be reached.",
-                    )
-                    logger.warning(str(e))
+                send_status_update(payload)
                 # consuming stops here, since the original document with
                 # the barcodes has been split and will be consumed separately
                 return "File successfully split"
@@ -195,14 +364,39 @@ def sanity_check():
 
 
 def bulk_update_documents(document_ids):
-    documents = Document.objects.filter(id__in=document_ids)
+    document_ids = iter(document_ids)
+    chunk = list(islice(document_ids, BULK_UPDATE_CHUNK_SIZE))
+    next_chunk = list(islice(document_ids, BULK_UPDATE_CHUNK_SIZE))
 
-    ix = index.open_index()
+    if not next_chunk:
+        # Small enough to not be worth the round trip through the broker.
+        bulk_update_documents_chunk(chunk)
+        return
+
+    # Fan out to separate tasks, so that other workers may pick them up.
+    while chunk:
+        async_task("documents.tasks.bulk_update_documents_chunk", document_ids=chunk)
+        chunk, next_chunk = next_chunk, list(
+            islice(document_ids, BULK_UPDATE_CHUNK_SIZE),
+        )
+
+
+def bulk_update_documents_chunk(document_ids):
+    # Evaluated once and used for both the signals and the index. Fetch
+    # everything the index and the filename generation need up front.
+    documents = list(
+        Document.objects.filter(id__in=document_ids)
+        .select_related("correspondent", "document_type", "storage_path")
+        .prefetch_related("tags"),
+    )
 
+    # Sent one after another on purpose: the file handling receivers hold the
+    # media lock while they generate unique filenames and move files, so
+    # sending these from multiple threads would not run any faster.
     for doc in documents:
         post_save.send(Document, instance=doc, created=False)
 
-    with AsyncWriter(ix) as writer:
+    with index.open_index_writer() as writer:
         for doc in documents:
             index.update_document(writer, doc)
 
@@ -811,6 +811,7 @@ class TestDocumentApi(DirectoriesMixin, APITestCase):
         self.assertIsNone(kwargs["override_correspondent_id"])
         self.assertIsNone(kwargs["override_document_type_id"])
         self.assertIsNone(kwargs["override_tag_ids"])
+        self.assertEqual(kwargs["mime_type"], "application/pdf")
 
     @mock.patch("documents.views.async_task")
     def test_upload_empty_metadata(self, m):
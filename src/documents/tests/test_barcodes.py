@@ -216,6 +216,17 @@ class TestBarcode(DirectoriesMixin, TestCase):
         pages = barcodes.scan_file_for_separating_barcodes(test_file)
         self.assertEqual(pages, [2, 5])
 
+    @override_settings(THREADS_PER_WORKER=3)
+    def test_scan_file_for_separating_barcodes_threads(self):
+        test_file = os.path.join(
+            os.path.dirname(__file__),
+            "samples",
+            "barcodes",
+            "several-patcht-codes.pdf",
+        )
+        pages = barcodes.scan_file_for_separating_barcodes(test_file)
+        self.assertEqual(pages, [2, 5])
+
     def test_scan_file_for_separating_barcodes_upsidedown(self):
         test_file = os.path.join(
             os.path.dirname(__file__),
@@ -435,6 +446,44 @@ class TestBarcode(DirectoriesMixin, TestCase):
         self.assertIsNone(kwargs["override_document_type_id"])
         self.assertIsNone(kwargs["override_tag_ids"])
 
+    @override_settings(CONSUMER_ENABLE_BARCODES=True)
+    @mock.patch("documents.barcodes.get_file_mime_type")
+    @mock.patch("documents.consumer.Consumer.try_consume_file")
+    def test_consume_barcode_unsupported_extension(self, m, get_file_mime_type):
+        """
+        The mime type of files with an extension unsupported by the barcode
+        reader should not be detected from their content.
+        """
+        test_file = os.path.join(
+            os.path.dirname(__file__),
+            "samples",
+            "simple.jpg",
+        )
+        dst = os.path.join(settings.SCRATCH_DIR, "simple.jpg")
+        shutil.copy(test_file, dst)
+
+        self.assertIn("Success", tasks.consume_file(dst))
+        get_file_mime_type.assert_not_called()
+        m.assert_called_once()
+
+    @override_settings(CONSUMER_ENABLE_BARCODES=True)
+    @mock.patch("documents.barcodes.get_file_mime_type")
+    def test_consume_barcode_file_known_mime_type(self, m):
+        test_file = os.path.join(
+            os.path.dirname(__file__),
+            "samples",
+            "barcodes",
+            "patch-code-t-middle.pdf",
+        )
+        dst = os.path.join(settings.SCRATCH_DIR, "patch-code-t-middle.pdf")
+        shutil.copy(test_file, dst)
+
+        self.assertEqual(
+            tasks.consume_file(dst, mime_type="application/pdf"),
+            "File successfully split",
+        )
+        m.assert_not_called()
+
     @override_settings(
         CONSUMER_ENABLE_BARCODES=True,
         CONSUMER_BARCODE_TIFF_SUPPORT=True,
@@ -5,6 +5,7 @@ from unittest import mock
 from django.core.checks import Error
 from django.test import override_settings
 from django.test import TestCase
+from documents.checks import archive_checksum_algorithm_check
 from documents.checks import changed_password_check
 from documents.checks import parser_check
 from documents.models import Document
@@ -76,3 +77,12 @@ class TestDocumentChecks(TestCase):
                     ),
                 ],
             )
+
+    def test_archive_checksum_algorithm_check(self):
+        self.assertEqual(archive_checksum_algorithm_check(None), [])
+
+        with override_settings(ARCHIVE_CHECKSUM_ALGORITHM="sha256"):
+            self.assertEqual(archive_checksum_algorithm_check(None), [])
+
+        with override_settings(ARCHIVE_CHECKSUM_ALGORITHM="crc32"):
+            self.assertEqual(len(archive_checksum_algorithm_check(None)), 1)
@@ -10,6 +10,7 @@ from django.test import override_settings
 from django.test import TestCase
 from documents.classifier import ClassifierModelCorruptError
 from documents.classifier import DocumentClassifier
+from documents.classifier import get_training_data_fingerprint
 from documents.classifier import IncompatibleClassifierVersionError
 from documents.classifier import load_classifier
 from documents.models import Correspondent
@@ -158,6 +159,30 @@ class TestClassifier(DirectoriesMixin, TestCase):
         self.assertTrue(self.classifier.train())
         self.assertFalse(self.classifier.train())
 
+    def testTrainingDataFingerprint(self):
+
+        self.generate_test_data()
+
+        fingerprint = get_training_data_fingerprint()
+        self.assertEqual(fingerprint, get_training_data_fingerprint())
+
+        # bulk edits don't touch the modification date
+        Document.objects.filter(pk=self.doc2.pk).update(correspondent=self.c3)
+        fingerprint2 = get_training_data_fingerprint()
+        self.assertNotEqual(fingerprint, fingerprint2)
+
+        self.doc1.tags.add(self.t3)
+        fingerprint3 = get_training_data_fingerprint()
+        self.assertNotEqual(fingerprint2, fingerprint3)
+
+        self.doc1.content = "some other content"
+        self.doc1.save()
+        fingerprint4 = get_training_data_fingerprint()
+        self.assertNotEqual(fingerprint3, fingerprint4)
+
+        with mock.patch("sklearn.__version__", "0.1"):
+            self.assertNotEqual(fingerprint4, get_training_data_fingerprint())
+
     def testVersionIncreased(self):
 
         self.generate_test_data()
@@ -25,6 +25,7 @@ from ..models import DocumentType
 from ..models import FileInfo
 from ..models import Tag
 from ..parsers import DocumentParser
+from ..parsers import get_parser_class_for_mime_type
 from ..parsers import ParseError
 from ..tasks import sanity_check
 from .utils import DirectoriesMixin
@@ -277,6 +278,10 @@ class TestConsumer(DirectoriesMixin, TestCase):
     def setUp(self):
         super().setUp()
 
+        # the parsers are mocked per test, don't use cached parser classes.
+        get_parser_class_for_mime_type.cache_clear()
+        self.addCleanup(get_parser_class_for_mime_type.cache_clear)
+
         patcher = mock.patch("documents.parsers.document_consumer_declaration.send")
         m = patcher.start()
         m.return_value = [
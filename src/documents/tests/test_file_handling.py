@@ -13,6 +13,7 @@ from django.test import override_settings
 from django.test import TestCase
 from django.utils import timezone
 
+from ..file_handling import calculate_archive_checksum
 from ..file_handling import create_source_path_directory
 from ..file_handling import delete_empty_directories
 from ..file_handling import generate_filename
@@ -1060,3 +1061,42 @@ def run():
     for i in range(30):
         doc.title = str(random.randrange(1, 5))
         doc.save()
+
+
+class TestArchiveChecksum(DirectoriesMixin, TestCase):
+    def test_calculate_archive_checksum(self):
+        sample = os.path.join(os.path.dirname(__file__), "samples", "simple.pdf")
+        with open(sample, "rb") as f:
+            content = f.read()
+
+        self.assertEqual(
+            calculate_archive_checksum(sample),
+            hashlib.md5(content).hexdigest(),
+        )
+
+        with override_settings(ARCHIVE_CHECKSUM_ALGORITHM="sha256"):
+            self.assertEqual(
+                calculate_archive_checksum(sample),
+                hashlib.sha256(content).hexdigest(),
+            )
+
+    def test_calculate_archive_checksum_empty_file(self):
+        path = os.path.join(self.dirs.scratch_dir, "empty.pdf")
+        Path(path).touch()
+
+        self.assertEqual(calculate_archive_checksum(path), hashlib.md5().hexdigest())
+
+    @mock.patch(
+        "documents.file_handling.mmap.mmap",
+        side_effect=ValueError("mmap length is too large"),
+    )
+    def test_calculate_archive_checksum_mmap_failed(self, m):
+        sample = os.path.join(os.path.dirname(__file__), "samples", "simple.pdf")
+        with open(sample, "rb") as f:
+            content = f.read()
+
+        self.assertEqual(
+            calculate_archive_checksum(sample),
+            hashlib.md5(content).hexdigest(),
+        )
+        m.assert_called_once()
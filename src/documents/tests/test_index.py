@@ -31,3 +31,14 @@ class TestAutoComplete(DirectoriesMixin, TestCase):
         )
         self.assertListEqual(index.autocomplete(ix, "tes", limit=1), [b"test3"])
         self.assertListEqual(index.autocomplete(ix, "tes", limit=0), [])
+
+
+class TestOpenIndex(DirectoriesMixin, TestCase):
+    def test_open_index_reused(self):
+        ix = index.open_index()
+
+        self.assertIs(index.open_index(), ix)
+
+        ix2 = index.open_index(recreate=True)
+        self.assertIsNot(ix2, ix)
+        self.assertIs(index.open_index(), ix2)
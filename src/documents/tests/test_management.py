@@ -10,6 +10,7 @@ from django.core.management import call_command
 from django.test import override_settings
 from django.test import TestCase
 from documents.file_handling import generate_filename
+from documents.management.commands.document_archiver import _move
 from documents.management.commands.document_archiver import handle_document
 from documents.models import Document
 from documents.tests.utils import DirectoriesMixin
@@ -57,6 +58,22 @@ class TestArchiver(DirectoriesMixin, TestCase):
         self.assertTrue(filecmp.cmp(sample_file, doc.source_path))
         self.assertEqual(doc.archive_filename, "none/A.pdf")
 
+    @mock.patch("documents.index.update_document")
+    def test_handle_document_index_content(self, update_document):
+
+        doc = self.make_models()
+        shutil.copy(
+            sample_file,
+            os.path.join(self.dirs.originals_dir, f"{doc.id:07}.pdf"),
+        )
+
+        handle_document(doc.pk)
+
+        doc = Document.objects.get(id=doc.id)
+
+        update_document.assert_called_once()
+        self.assertEqual(update_document.call_args[0][1].content, doc.content)
+
     def test_unknown_mime_type(self):
         doc = self.make_models()
         doc.mime_type = "sdgfh"
@@ -72,6 +89,18 @@ class TestArchiver(DirectoriesMixin, TestCase):
         self.assertIsNone(doc.archive_filename)
         self.assertTrue(os.path.isfile(doc.source_path))
 
+    def test_move(self):
+        source = os.path.join(self.dirs.scratch_dir, "archive.pdf")
+        target = os.path.join(self.dirs.archive_dir, "0000001.pdf")
+        shutil.copy(sample_file, source)
+        Path(target).write_text("old archive")
+
+        _move(source, target)
+
+        self.assertFalse(os.path.exists(source))
+        self.assertFalse(os.path.exists(target + ".tmp"))
+        self.assertTrue(filecmp.cmp(sample_file, target))
+
     @override_settings(FILENAME_FORMAT="{title}")
     def test_naming_priorities(self):
         doc1 = Document.objects.create(
@@ -104,6 +133,25 @@ class TestArchiver(DirectoriesMixin, TestCase):
         self.assertEqual(doc2.archive_filename, "document_01.pdf")
 
 
+class TestRehashArchives(DirectoriesMixin, TestCase):
+    @override_settings(ARCHIVE_CHECKSUM_ALGORITHM="sha256")
+    def test_rehash_archives(self):
+        doc = Document.objects.create(
+            checksum="A",
+            title="A",
+            mime_type="application/pdf",
+            archive_filename="0000001.pdf",
+            archive_checksum="B",
+        )
+        shutil.copy(sample_file, doc.archive_path)
+
+        call_command("document_rehash_archives", "--no-progress-bar")
+
+        doc.refresh_from_db()
+        with open(sample_file, "rb") as f:
+            self.assertEqual(doc.archive_checksum, hashlib.sha256(f.read()).hexdigest())
+
+
 class TestDecryptDocuments(TestCase):
     @override_settings(
         ORIGINALS_DIR=os.path.join(os.path.dirname(__file__), "samples", "originals"),
@@ -29,6 +29,11 @@ def fake_magic_from_file(file, mime=False):
 
 @mock.patch("documents.parsers.magic.from_file", fake_magic_from_file)
 class TestParserDiscovery(TestCase):
+    def setUp(self):
+        super().setUp()
+        get_parser_class_for_mime_type.cache_clear()
+        self.addCleanup(get_parser_class_for_mime_type.cache_clear)
+
     @mock.patch("documents.parsers.document_consumer_declaration.send")
     def test__get_parser_class_1_parser(self, m, *args):
         class DummyParser:
@@ -82,6 +87,26 @@ class TestParserDiscovery(TestCase):
         with TemporaryDirectory() as tmpdir:
             self.assertIsNone(get_parser_class("doc.pdf"))
 
+    @mock.patch("documents.parsers.document_consumer_declaration.send")
+    def test__get_parser_class_cached(self, m, *args):
+        class DummyParser:
+            pass
+
+        m.return_value = (
+            (
+                None,
+                {
+                    "weight": 0,
+                    "parser": DummyParser,
+                    "mime_types": {"application/pdf": ".pdf"},
+                },
+            ),
+        )
+
+        self.assertEqual(get_parser_class_for_mime_type("application/pdf"), DummyParser)
+        self.assertEqual(get_parser_class_for_mime_type("application/pdf"), DummyParser)
+        m.assert_called_once()
+
 
 def fake_get_thumbnail(self, path, mimetype, file_name):
     return os.path.join(os.path.dirname(__file__), "examples", "no-text.png")
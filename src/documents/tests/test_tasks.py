@@ -1,13 +1,17 @@
 import os
+import threading
 from unittest import mock
 
 from django.conf import settings
+from django.test import override_settings
 from django.test import TestCase
 from django.utils import timezone
+from documents import index
 from documents import tasks
 from documents.models import Correspondent
 from documents.models import Document
 from documents.models import DocumentType
+from documents.models import StoragePath
 from documents.models import Tag
 from documents.sanity_checker import SanityCheckFailedException
 from documents.sanity_checker import SanityCheckMessages
@@ -27,6 +31,98 @@ class TestIndexReindex(DirectoriesMixin, TestCase):
 
         tasks.index_reindex()
 
+    def _run_shards_in_process(self, pool, before_shards=None):
+        # run the shards in process, since the test database is not shared
+        def make_pool(processes, initializer, initargs):
+            initializer(*initargs)
+            return mock.DEFAULT
+
+        def map_async(func, iterable):
+            if before_shards:
+                before_shards()
+            result = mock.Mock()
+            result.ready.return_value = True
+            result.get.return_value = list(map(func, iterable))
+            return result
+
+        pool.return_value.__enter__.return_value.map_async = map_async
+        pool.side_effect = make_pool
+
+    @override_settings(TASK_WORKERS=2)
+    @mock.patch("documents.tasks.multiprocessing.Pool")
+    def test_index_reindex_sharded(self, m):
+        self._run_shards_in_process(m)
+        for i in range(5):
+            Document.objects.create(
+                title=f"test {i}",
+                content=f"my document {i}",
+                checksum=f"wow{i}",
+            )
+
+        tasks.index_reindex()
+
+        with index.open_index_searcher() as searcher:
+            self.assertEqual(searcher.doc_count(), 5)
+            self.assertCountEqual(
+                [doc["id"] for doc in searcher.documents()],
+                Document.objects.values_list("id", flat=True),
+            )
+
+    @override_settings(TASK_WORKERS=2)
+    @mock.patch("documents.tasks.multiprocessing.Pool")
+    def test_index_reindex_sharded_locked(self, m):
+        self._run_shards_in_process(m)
+        for i in range(3):
+            Document.objects.create(
+                title=f"test {i}",
+                content=f"my document {i}",
+                checksum=f"wow{i}",
+            )
+
+        # another process holding the lock when the reindex starts
+        writer = index.open_index().writer()
+        threading.Timer(0.5, writer.cancel).start()
+
+        tasks.index_reindex()
+
+        with index.open_index_searcher() as searcher:
+            self.assertEqual(searcher.doc_count(), 3)
+
+    @override_settings(TASK_WORKERS=2)
+    @mock.patch("documents.tasks.multiprocessing.Pool")
+    def test_index_reindex_sharded_concurrent_update(self, m):
+        for i in range(4):
+            Document.objects.create(
+                title=f"test {i}",
+                content=f"my document {i}",
+                checksum=f"wow{i}",
+            )
+        doc = Document.objects.prefetch_related("tags").get(title="test 2")
+
+        def update_document():
+            writer = index.open_index().writer(timeout=5)
+            index.update_document(writer, doc)
+            writer.commit()
+
+        # another process updating a document while the shards are built
+        concurrent_update = threading.Thread(target=update_document)
+
+        def before_shards():
+            concurrent_update.start()
+            concurrent_update.join(timeout=0.5)
+
+        self._run_shards_in_process(m, before_shards=before_shards)
+
+        tasks.index_reindex()
+        concurrent_update.join()
+
+        with index.open_index_searcher() as searcher:
+            self.assertEqual(searcher.doc_count(), 4)
+            self.assertCountEqual(
+                [d["id"] for d in searcher.documents()],
+                Document.objects.values_list("id", flat=True),
+            )
+
     def test_index_optimize(self):
         Document.objects.create(
             title="test",
@@ -70,6 +166,24 @@ class TestClassifier(DirectoriesMixin, TestCase):
         load_classifier.assert_called_once()
         self.assertFalse(os.path.isfile(settings.MODEL_FILE))
 
+    @mock.patch("documents.tasks.load_classifier")
+    def test_train_classifier_with_auto_storage_path(self, load_classifier):
+        load_classifier.return_value = None
+        StoragePath.objects.create(
+            matching_algorithm=Tag.MATCH_AUTO,
+            name="test",
+            path="{title}",
+        )
+        tasks.train_classifier()
+        load_classifier.assert_called_once()
+        self.assertFalse(os.path.isfile(settings.MODEL_FILE))
+
+    @mock.patch("documents.tasks.load_classifier")
+    def test_train_classifier_auto_matching_single_query(self, load_classifier):
+        with self.assertNumQueries(1):
+            tasks.train_classifier()
+        load_classifier.assert_not_called()
+
     def test_train_classifier(self):
         c = Correspondent.objects.create(matching_algorithm=Tag.MATCH_AUTO, name="test")
         doc = Document.objects.create(correspondent=c, content="test", title="test")
@@ -91,6 +205,21 @@ class TestClassifier(DirectoriesMixin, TestCase):
         mtime3 = os.stat(settings.MODEL_FILE).st_mtime
         self.assertNotEqual(mtime2, mtime3)
 
+    @mock.patch("documents.tasks.load_classifier")
+    def test_train_classifier_fingerprint_unchanged(self, load_classifier):
+        load_classifier.return_value = None
+        c = Correspondent.objects.create(matching_algorithm=Tag.MATCH_AUTO, name="test")
+        Document.objects.create(correspondent=c, content="test", title="test")
+
+        tasks.train_classifier()
+        load_classifier.assert_called_once()
+        self.assertTrue(os.path.isfile(settings.MODEL_FILE))
+
+        # training data unchanged, the model should not even be loaded
+        load_classifier.reset_mock()
+        tasks.train_classifier()
+        load_classifier.assert_not_called()
+
 
 class TestSanityCheck(DirectoriesMixin, TestCase):
     @mock.patch("documents.tasks.sanity_checker.check_sanity")
@@ -142,3 +271,75 @@ class TestBulkUpdate(DirectoriesMixin, TestCase):
         )
 
         tasks.bulk_update_documents([doc1.pk])
+
+    @mock.patch("documents.tasks.BULK_UPDATE_CHUNK_SIZE", 2)
+    @mock.patch("documents.tasks.async_task")
+    def test_bulk_update_documents_chunked(self, async_task):
+        tasks.bulk_update_documents([1, 2, 3, 4, 5])
+
+        self.assertEqual(
+            [kwargs["document_ids"] for _, kwargs in async_task.call_args_list],
+            [[1, 2], [3, 4], [5]],
+        )
+
+    @mock.patch("documents.tasks.BULK_UPDATE_CHUNK_SIZE", 2)
+    @mock.patch("documents.tasks.async_task")
+    def test_bulk_update_documents_single_chunk(self, async_task):
+        tasks.bulk_update_documents([1, 2])
+
+        async_task.assert_not_called()
+
+    def test_bulk_update_documents_chunk_queries(self):
+        c = Correspondent.objects.create(name="c")
+        t = Tag.objects.create(name="t")
+        for i in range(3):
+            doc = Document.objects.create(
+                title=f"test {i}",
+                content="my document",
+                checksum=f"wow{i}",
+                correspondent=c,
+            )
+            doc.tags.add(t)
+
+        document_ids = list(Document.objects.values_list("id", flat=True))
+
+        # one query for the documents, one for their tags
+        with self.assertNumQueries(2):
+            tasks.bulk_update_documents_chunk(document_ids)
+
+
+class TestStatusUpdate(TestCase):
+    @mock.patch("documents.tasks.get_channel_layer")
+    def test_send_status_update(self, get_channel_layer):
+        group_send = mock.AsyncMock()
+        get_channel_layer.return_value.group_send = group_send
+        payload = {"task_id": "abc", "current_progress": 100}
+
+        tasks.send_status_update(payload).result(timeout=5)
+
+        group_send.assert_awaited_once_with(
+            "status_updates",
+            {"type": "status_update", "data": payload},
+        )
+
+    @mock.patch("documents.tasks.get_channel_layer")
+    def test_send_status_update_broker_unreachable(self, get_channel_layer):
+        get_channel_layer.return_value.group_send = mock.AsyncMock(
+            side_effect=OSError("Connection refused"),
+        )
+
+        with self.assertLogs("paperless.tasks", level="WARNING") as cm:
+            tasks.send_status_update({}).result(timeout=5)
+
+        self.assertIn("Connection refused", cm.output[-1])
+
+    @mock.patch("documents.tasks.get_channel_layer")
+    def test_send_status_update_error(self, get_channel_layer):
+        get_channel_layer.return_value.group_send = mock.AsyncMock(
+            side_effect=ValueError("Something went wrong"),
+        )
+
+        with self.assertLogs("paperless.tasks", level="ERROR") as cm:
+            tasks.send_status_update({}).result(timeout=5)
+
+        self.assertIn("Something went wrong", cm.output[-1])
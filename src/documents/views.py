@@ -519,7 +519,7 @@ class PostDocumentView(GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        doc_name, doc_data = serializer.validated_data.get("document")
+        doc_name, doc_data, mime_type = serializer.validated_data.get("document")
         correspondent_id = serializer.validated_data.get("correspondent")
         document_type_id = serializer.validated_data.get("document_type")
         tag_ids = serializer.validated_data.get("tags")
@@ -552,6 +552,7 @@ class PostDocumentView(GenericAPIView):
             task_id=task_id,
             task_name=os.path.basename(doc_name)[:100],
             override_created=created,
+            mime_type=mime_type,
         )
 
         return Response("OK")
@@ -462,6 +462,11 @@ Q_CLUSTER = {
     "retry": PAPERLESS_WORKER_RETRY,
     "timeout": PAPERLESS_WORKER_TIMEOUT,
     "workers": TASK_WORKERS,
+    # Tasks like consuming documents take long and vary a lot in duration.
+    # Don't fetch more tasks from the broker than there are workers, so that
+    # other paperless instances sharing the broker can pick them up instead,
+    # and fewer fetched tasks are lost if the cluster stops unexpectedly.
+    "queue_limit": TASK_WORKERS,
     "redis": os.getenv("PAPERLESS_REDIS", "redis://localhost:6379"),
     "log_level": "DEBUG" if DEBUG else "INFO",
 }
@@ -524,6 +529,12 @@ CONSUMER_BARCODE_TIFF_SUPPORT = __get_boolean(
 
 CONSUMER_BARCODE_STRING = os.getenv("PAPERLESS_CONSUMER_BARCODE_STRING", "PATCHT")
 
+# md5 or sha256. sha256 is considerably faster on CPUs with SHA extensions.
+ARCHIVE_CHECKSUM_ALGORITHM = os.getenv(
+    "PAPERLESS_ARCHIVE_CHECKSUM_ALGORITHM",
+    "md5",
+).lower()
+
 OCR_PAGES = int(os.getenv("PAPERLESS_OCR_PAGES", 0))
 
 # The default language that tesseract will attempt to use when parsing
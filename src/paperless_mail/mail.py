@@ -401,6 +401,7 @@ class MailAccountHandler(LoggingMixin):
                     override_document_type_id=doc_type.id if doc_type else None,
                     override_tag_ids=tag_ids,
                     task_name=att.filename[:100],
+                    mime_type=mime_type,
                 )
 
                 processed_attachments += 1
@@ -396,6 +396,7 @@ class TestMail(DirectoriesMixin, TestCase):
         args, kwargs = self.async_task.call_args
         self.assertTrue(os.path.isfile(kwargs["path"]), kwargs["path"])
         self.assertEqual(kwargs["override_filename"], "f1.pdf")
+        self.assertEqual(kwargs["mime_type"], "application/pdf")
 
     def test_handle_disposition(self):
         message = create_message(